@@ -0,0 +1,5 @@
+import sys
+
+from hearts.cli import main
+
+sys.exit(main())
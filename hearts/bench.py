@@ -0,0 +1,85 @@
+"""Startup and throughput benchmarks."""
+
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from hearts.rules import Rules
+
+# Cumulative `python -X importtime` budget for the core modules
+IMPORT_BUDGET_MS = 100
+# Allowed slowdown of full rules games over simplified games
+RULES_OVERHEAD_BUDGET = 0.15
+CORE_MODULES = ("hearts.game",)
+
+
+def measure_import_time(module: str, repeat: int = 5) -> float:
+    """Best cumulative import time of a module in a fresh interpreter, in ms."""
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            _, cumulative_us, name = (part.strip() for part in line.split("|"))
+            if name == module:
+                times.append(int(cumulative_us) / 1000)
+
+    return min(times)
+
+
+def measure_games(games: int, seed: int = 0, rules: Rules | None = None) -> float:
+    """Rounds per second for four ``RandomPlayer``s.
+
+    Rounds rather than games, since rules like shooting the moon change how
+    many rounds a game lasts.
+    """
+    from hearts.game import Game
+    from hearts.players import RandomPlayer
+
+    random.seed(seed)
+    players = [RandomPlayer(f"Random {i + 1}") for i in range(4)]
+
+    rounds = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        game = Game(players, print_scores=False, rules=rules)
+        game.play()
+        rounds += game.round_index
+
+    return rounds / (time.perf_counter() - start)
+
+
+def bench(
+    games: int = 100,
+    import_budget_ms: float = IMPORT_BUDGET_MS,
+    rules_budget: float = RULES_OVERHEAD_BUDGET,
+) -> bool:
+    """Print benchmark results, returning whether they are within budget."""
+    within_budget = True
+    for module in CORE_MODULES:
+        import_ms = measure_import_time(module)
+        status = "ok" if import_ms <= import_budget_ms else "over budget"
+        print(f"import {module}: {import_ms:.1f} ms ({status}, budget {import_budget_ms:.0f} ms)")
+        within_budget &= import_ms <= import_budget_ms
+
+    # Same seed for both, median of interleaved pairs to smooth out noise
+    pairs = [
+        (measure_games(games), measure_games(games, rules=Rules.full()))
+        for _ in range(7)
+    ]
+    simplified = statistics.median(pair[0] for pair in pairs)
+    full = statistics.median(pair[1] for pair in pairs)
+    overhead = statistics.median(pair[0] / pair[1] - 1 for pair in pairs)
+    status = "ok" if overhead <= rules_budget else "over budget"
+    print(f"random games: {simplified:.1f} rounds/s")
+    print(f"random games, full rules: {full:.1f} rounds/s")
+    print(f"full rules overhead: {overhead:.1%} ({status}, budget {rules_budget:.0%})")
+    within_budget &= overhead <= rules_budget
+
+    return within_budget
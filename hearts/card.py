@@ -1,10 +1,14 @@
 from typing import Self
 
+SUITS = ("♥", "♦", "♣", "♠")
+VALUES = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+
 
 class Card:
     def __init__(self, suit, value):
         self._suit: str = suit
         self._value: str = value
+        self._index: int = SUITS.index(suit) * 13 + VALUES.index(value)
 
     @property
     def suit(self) -> str:
@@ -14,36 +18,23 @@ class Card:
     def value(self) -> str:
         return self._value
 
+    @property
+    def index(self) -> int:
+        """Position of the card in a deck ordered by suit then value."""
+        return self._index
+
     def __repr__(self):
         return f"{self._value}{self._suit}"
 
     def _get_numeric_value(self):
         """Convert card value to numeric for comparison"""
-        values = {
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "10": 10,
-            "J": 11,
-            "Q": 12,
-            "K": 13,
-            "A": 14,
-        }
-        return values.get(self._value, 0)
+        return self._index % 13 + 2
 
     def __eq__(self, other: "Self"):
-        return (
-            self._get_numeric_value() == other._get_numeric_value()
-            and self._suit == other._suit
-        )
+        return self._index == other._index
 
     def __lt__(self, other: "Self"):
         return self._get_numeric_value() < other._get_numeric_value()
-    
+
     def __hash__(self):
         return hash((self.suit, self.value))
@@ -0,0 +1,98 @@
+import argparse
+import sys
+
+from hearts.bench import IMPORT_BUDGET_MS, RULES_OVERHEAD_BUDGET
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="hearts", description="Hearts experiments")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run an experiment.")
+    run_parser.add_argument(
+        "--config", type=str, required=True, help="Path to .yaml config file."
+    )
+    run_parser.add_argument(
+        "--db", type=str, default=None, help="Path to the results database."
+    )
+
+    analyze_parser = subparsers.add_parser("analyze", help="Plot experiment results.")
+    analyze_parser.add_argument(
+        "name", type=str, help="Results file in results/ without the extension."
+    )
+
+    rate_parser = subparsers.add_parser("rate", help="Update agent ratings.")
+    rate_parser.add_argument(
+        "--db", type=str, default=None, help="Path to the results database."
+    )
+    rate_parser.add_argument(
+        "--k", type=float, default=32.0, help="Elo update factor."
+    )
+    rate_parser.add_argument(
+        "--scale", type=float, default=400.0, help="Rating points per 10x odds."
+    )
+    rate_parser.add_argument(
+        "--recompute",
+        action="store_true",
+        help="Fit Bradley-Terry ratings from all games instead of updating Elo.",
+    )
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark import time and games.")
+    bench_parser.add_argument(
+        "--games", type=int, default=100, help="Number of games to time."
+    )
+    bench_parser.add_argument(
+        "--import-budget",
+        type=float,
+        default=IMPORT_BUDGET_MS,
+        help="Import time budget in milliseconds.",
+    )
+    bench_parser.add_argument(
+        "--rules-budget",
+        type=float,
+        default=RULES_OVERHEAD_BUDGET,
+        help="Allowed slowdown of full rules games, as a fraction.",
+    )
+
+    args = parser.parse_args(argv)
+
+    # Only the subcommand being run pays for its imports
+    match args.command:
+        case "run":
+            from hearts.experiments import ExperimentConfig, run_experiment
+            from hearts.results import DEFAULT_PATH
+
+            run_experiment(ExperimentConfig.from_yaml(args.config), args.db or DEFAULT_PATH)
+
+        case "analyze":
+            from hearts.analysis import analyze
+
+            analyze(args.name)
+
+        case "rate":
+            from hearts.ratings import BatchRatings, EloRatings
+            from hearts.results import DEFAULT_PATH, ResultsStore
+
+            with ResultsStore(args.db or DEFAULT_PATH) as store:
+                if args.recompute:
+                    ratings = BatchRatings(scale=args.scale)
+                    count = ratings.recompute(store)
+                else:
+                    ratings = EloRatings(k=args.k, scale=args.scale)
+                    count = ratings.update_from_store(store)
+
+            print(f"Rated {count} games ({ratings.model})")
+            for variant, rating, games in ratings.leaderboard():
+                print(f"{rating:7.1f} {games:6d}  {variant}")
+
+        case "bench":
+            from hearts.bench import bench
+
+            if not bench(args.games, args.import_budget, args.rules_budget):
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+from hearts.game import Game
+from hearts.players import Player, SluffingPlayer, RandomPlayer, MinCardPlayer, MinMaxCardPlayer, MCTSPlayer
+from hearts.results import DEFAULT_PATH, ResultsStore
+from hearts.rules import Rules
+from dataclasses import asdict, dataclass, field
+import inspect
+import random
+import os
+
+
+def create_player(type: str, name: str, **params) -> Player:
+    match type:
+        case "sluffing":
+            return SluffingPlayer(name, **params)
+
+        case "random":
+            return RandomPlayer(name, **params)
+        
+        case "min":
+            return MinCardPlayer(name, **params)
+        
+        case "minmax":
+            return MinMaxCardPlayer(name, **params)
+        
+        case "mcts":
+            return MCTSPlayer(name, **params)
+
+        case _:
+            raise NotImplementedError(f"{type} player is not implemented.")
+
+
+def player_spec(type: str, player: Player) -> dict:
+    """Player config including the defaults of its constructor parameters."""
+    spec = {"type": type, "name": player.name}
+    for param in inspect.signature(player.__class__.__init__).parameters:
+        if param not in ("self", "name") and hasattr(player, param):
+            spec[param] = getattr(player, param)
+
+    return spec
+
+
+@dataclass
+class ExperimentConfig:
+    name: str
+    seed: int
+    players: list[dict]
+    games: int
+    max_points: int
+    rules: dict[str, bool] = field(default_factory=dict)
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "ExperimentConfig":
+        import yaml
+
+        with open(path, "r") as file:
+            return cls(**yaml.safe_load(file))
+
+@dataclass
+class Results:
+    game_name: str
+    player_scores: list[dict]
+
+    def __repr__(self) -> str:
+        results_str ="\n" +  "-"* 5 + f" {self.game_name} " + "-" * 5
+        for player_score in self.player_scores:
+            player = player_score['player']
+            score = player_score['score']
+            results_str += f"\n{player}: {score}"
+
+        return results_str
+
+
+def run_experiment(config: ExperimentConfig, db_path: str = DEFAULT_PATH) -> str:
+    """Play every game of an experiment, record it in the results store and
+    write the results parquet file."""
+    import polars as pl
+    from rich import print
+
+    random.seed(config.seed)
+
+    players = [create_player(**player_config) for player_config in config.players]
+    rules = Rules(**config.rules)
+    specs = [
+        player_spec(player_config["type"], player)
+        for player_config, player in zip(config.players, players)
+    ]
+
+    results_list = []
+    with ResultsStore(db_path) as store:
+        experiment_id = store.add_experiment(asdict(config))
+
+        for i in range(config.games):
+            game_name = f"{config.name} {i + 1}"
+            game = Game(players=players, max_points=config.max_points, print_scores=True, rules=rules)
+
+            results = Results(
+                game_name=game_name,
+                player_scores=game.play()
+            )
+            print(results)
+
+            # Record each game as it finishes so readers see live results
+            store.add_game(experiment_id, specs, results.game_name, results.player_scores)
+            results_list.append(results)
+
+    results_dicts = [
+        {
+            "game_name": results.game_name,
+            **player_score
+        }
+        for results in results_list
+        for player_score in results.player_scores
+    ]
+    
+    df = pl.from_dicts(results_dicts)
+
+    os.makedirs("results", exist_ok=True)
+    path = f"results/{game_name.lower().replace(' ', '_')}.parquet"
+    df.write_parquet(path)
+    return path
@@ -1,7 +1,17 @@
-from hearts.players import Player
+from hearts.players import Player, ReplayPlayer
 from hearts.deck import Deck
 from hearts.card import Card
-from rich import print
+from hearts.rules import PASS_OFFSETS, Rules, trick_points, trick_winner
+from hearts.snapshot import GameSnapshot, RoundLogWriter, RoundRecord
+from typing import Self
+import random
+
+
+def _print(*objects) -> None:
+    # rich is only loaded once a game actually prints
+    from rich import print
+
+    print(*objects)
 
 
 class Game:
@@ -10,15 +20,28 @@ class Game:
         players: list[Player],
         max_points: int = 100,
         print_scores: bool = True,
+        round_log: RoundLogWriter | None = None,
+        rules: Rules | None = None,
     ) -> None:
         self.players = players
         self.max_points = max_points
         self.print_scores = print_scores
+        self.round_log = round_log
+        self.rules = rules or Rules()
+        self._allowed_masks = self.rules.allowed_masks()
+        for player in players:
+            player.rules = self.rules
         self.deck = Deck()
         self.lead_player_index = 0
         self.scores = [0] * 4
         self.round_scores = [0] * 4
         self.played_cards: list[Card] = []
+        self.dealt_hands: list[list[Card]] = [[] for _ in range(4)]
+        self.round_lead_player_index = 0
+        self.passed_cards: list[list[Card]] = [[] for _ in range(4)]
+        self.pass_offset = 0
+        self.round_index = 0
+        self.hearts_broken = False
 
     @property
     def game_over(self) -> bool:
@@ -26,61 +49,213 @@ class Game:
             if score >= self.max_points:
                 return True
 
+    @property
+    def round_in_progress(self) -> bool:
+        return any(len(player.hand) > 0 for player in self.players)
+
     def play(self) -> dict:
         # Play rounds
         while not self.game_over:
-            # Reset round scores
-            self.round_scores = [0] * 4
+            # A resumed game finishes its current round first
+            if not self.round_in_progress:
+                self.deal()
 
-            # Deal cards
-            self.deck.reset()
-            self.deck.shuffle()
-            self.played_cards = []
-            for player in self.players:
-                player.hand = self.deck.deal(13)
-
-            # Play tricks
-            for i in range(13):
-                print("\n" + "-" * 5 + f" Trick {i + 1} " + "-" * 5)
-                self.play_trick()
-            self.scores = [
-                score + round_score
-                for score, round_score in zip(self.scores, self.round_scores)
-            ]
+            self.play_round()
 
         return [
             {"player": player.name, "score": score}
             for player, score in zip(self.players, self.scores)
         ]
 
+    def deal(
+        self,
+        hands: list[list[Card]] | None = None,
+        passes: list[list[Card]] | None = None,
+        pass_offset: int | None = None,
+    ) -> None:
+        """Deal a new round, from a shuffled deck unless hands are given.
+
+        ``passes`` and ``pass_offset`` replay recorded passing instead of
+        letting the players choose by the round's passing direction.
+        """
+        # Reset round scores
+        self.round_scores = [0] * 4
+        self.played_cards = []
+        self.hearts_broken = False
+
+        if hands is None:
+            self.deck.reset()
+            self.deck.shuffle()
+            hands = [self.deck.deal(13) for _ in self.players]
+
+        for player, hand in zip(self.players, hands):
+            player.hand = hand.copy()
+        self.dealt_hands = [hand.copy() for hand in hands]
+
+        if pass_offset is None:
+            pass_offset = 0
+            if self.rules.passing:
+                pass_offset = PASS_OFFSETS[self.round_index % len(PASS_OFFSETS)]
+        self.pass_offset = pass_offset
+        self.passed_cards = self.pass_cards(pass_offset, passes)
+
+        if self.rules.two_of_clubs_leads:
+            two_of_clubs = Card("♣", "2").index
+            for i, player in enumerate(self.players):
+                if two_of_clubs in [card._index for card in player.hand]:
+                    self.lead_player_index = i
+
+        self.round_lead_player_index = self.lead_player_index
+
+    def pass_cards(
+        self, offset: int, passes: list[list[Card]] | None = None
+    ) -> list[list[Card]]:
+        """Pass cards to the player ``offset`` seats on, returning the cards
+        each player passed."""
+        if offset == 0:
+            return [[] for _ in self.players]
+
+        if passes is None:
+            passes = [player.pass_cards() for player in self.players]
+        else:
+            for player, cards in zip(self.players, passes):
+                for card in cards:
+                    player.hand.remove(card)
+
+        for i, cards in enumerate(passes):
+            self.players[(i + offset) % 4].hand.extend(cards)
+
+        return [cards.copy() for cards in passes]
+
+    def play_round(self) -> None:
+        """Play the remaining tricks of the current round."""
+        for i in range(len(self.played_cards) // 4, 13):
+            if self.print_scores:
+                _print("\n" + "-" * 5 + f" Trick {i + 1} " + "-" * 5)
+            self.play_trick()
+
+        round_scores = self.rules.score_round(self.round_scores)
+        self.scores = [
+            score + round_score
+            for score, round_score in zip(self.scores, round_scores)
+        ]
+        self.round_index += 1
+
+        if self.round_log is not None:
+            self.round_log.write(self.round_record())
+
+    def round_record(self) -> RoundRecord:
+        return RoundRecord(
+            hands=[hand.copy() for hand in self.dealt_hands],
+            plays=self.played_cards.copy(),
+            lead_player_index=self.round_lead_player_index,
+            round_scores=self.round_scores.copy(),
+            rules=self.rules,
+            passes=[cards.copy() for cards in self.passed_cards],
+            pass_offset=self.pass_offset,
+        )
+
+    def snapshot(self, include_rng: bool = False) -> GameSnapshot:
+        """Capture the game between tricks, optionally with the RNG state."""
+        return GameSnapshot(
+            max_points=self.max_points,
+            scores=self.scores.copy(),
+            lead_player_index=self.lead_player_index,
+            round_index=self.round_index,
+            rules=self.rules,
+            round=self.round_record() if self.round_in_progress else None,
+            rng_state=random.getstate() if include_rng else None,
+        )
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: GameSnapshot,
+        players: list[Player],
+        print_scores: bool = True,
+        round_log: RoundLogWriter | None = None,
+    ) -> "Self":
+        """Resume a game from a snapshot with the given players.
+
+        The tricks already played in the current round are shown to the
+        players through ``observe_trick``, as if they had played them.
+        """
+        game = cls(players, snapshot.max_points, print_scores, round_log, snapshot.rules)
+        game.scores = list(snapshot.scores)
+        game.lead_player_index = snapshot.lead_player_index
+        game.round_index = snapshot.round_index
+
+        if snapshot.round is not None:
+            # Checks the recorded plays are legal
+            replay = replay_round(snapshot.round)
+
+            for player, hand in zip(players, snapshot.round.played_hands()):
+                player.hand = hand
+            game.lead_player_index = replay.round_lead_player_index
+            for i in range(0, len(replay.played_cards), 4):
+                trick = replay.played_cards[i : i + 4]
+                for position, card in enumerate(trick):
+                    players[(game.lead_player_index + position) % 4].hand.remove(card)
+                game.end_trick(trick, trick_winner(trick))
+
+            game.round_scores = replay.round_scores
+            game.played_cards = replay.played_cards
+            game.dealt_hands = replay.dealt_hands
+            game.passed_cards = replay.passed_cards
+            game.pass_offset = replay.pass_offset
+            game.round_lead_player_index = replay.round_lead_player_index
+            game.hearts_broken = replay.hearts_broken
+
+        if snapshot.rng_state is not None:
+            random.setstate(snapshot.rng_state)
+
+        return game
+
     def play_trick(self) -> None:
         trick: list[Card] = []
-        hearts: int = 0
+        allowed_masks = self._allowed_masks[len(self.played_cards) < 4]
         for i in range(0, 4):
             player_index = (self.lead_player_index + i) % 4
             player = self.players[player_index]
 
+            player.allowed_cards = allowed_masks[i == 0][self.hearts_broken]
             card = player.play_card(trick)
 
             trick.append(card)
             self.played_cards.append(card)
-            print(f"{player} played {card}")
+            if self.print_scores:
+                _print(f"{player} played {card}")
 
             if card._suit == "♥":
-                hearts += 1
+                self.hearts_broken = True
 
-            if card == Card("♠", "Q"):
-                hearts += 13
+        self.end_trick(trick, trick_winner(trick))
 
-        lead_suit = trick[0].suit
-        max_card = trick[0]
-        max_card_index = 0
-        for i, card in enumerate(trick):
-            if card.suit == lead_suit and card > max_card:
-                max_card = card
-                max_card_index = i
+    def end_trick(self, trick: list[Card], winner: int) -> None:
+        """Show a completed trick to every player and give its points to the
+        winner, who leads the next one."""
+        for i in range(4):
+            self.players[(self.lead_player_index + i) % 4].observe_trick(trick, i, winner)
 
-        winning_player_index = (self.lead_player_index + max_card_index) % 4
+        winning_player_index = (self.lead_player_index + winner) % 4
         self.lead_player_index = winning_player_index
 
-        self.round_scores[winning_player_index] += hearts
+        self.round_scores[winning_player_index] += trick_points(trick)
+
+
+def replay_round(record: RoundRecord, print_scores: bool = False) -> Game:
+    """Replay a recorded round through ``Game.play_trick`` under its rules.
+
+    Raises ``ValueError`` if the record contains an illegal play.
+    """
+    plays = iter(record.plays)
+    players = [ReplayPlayer(f"Player {i + 1}", plays) for i in range(4)]
+
+    game = Game(players, print_scores=print_scores, rules=record.rules)
+    game.lead_player_index = record.lead_player_index
+    game.deal(record.hands, record.passes, record.pass_offset)
+
+    for _ in range(len(record.plays) // 4):
+        game.play_trick()
+
+    return game
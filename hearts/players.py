@@ -1,5 +1,7 @@
 from hearts.card import Card
+from hearts.rules import Rules, trick_points, trick_winner
 from abc import ABC, abstractmethod
+from typing import Iterator
 import random
 import math
 
@@ -8,6 +10,10 @@ class Player(ABC):
     def __init__(self, name: str) -> None:
         self._name = name
         self._hand: list[Card] = []
+        # Rules of the game being played, set by the game
+        self.rules = Rules()
+        # Whether the game rules currently allow each card index, if restricted
+        self.allowed_cards: tuple[bool, ...] | None = None
 
     def __repr__(self):
         return self.name
@@ -25,14 +31,34 @@ class Player(ABC):
         self._hand = hand
 
     def get_valid_cards(self, trick: list[Card]) -> list[Card]:
+        valid_cards = self._hand
         if len(trick) > 0:
             lead_suit = trick[0].suit
-            valid_cards = [card for card in self._hand if card.suit == lead_suit]
+            lead_suit_cards = [card for card in self._hand if card.suit == lead_suit]
 
-            if len(valid_cards) > 0:
-                return valid_cards
+            if len(lead_suit_cards) > 0:
+                valid_cards = lead_suit_cards
 
-        return self._hand
+        if self.allowed_cards is not None:
+            allowed = self.allowed_cards
+            allowed_cards = [card for card in valid_cards if allowed[card._index]]
+
+            if len(allowed_cards) > 0:
+                return allowed_cards
+
+        return valid_cards
+
+    def observe_trick(self, trick: list[Card], position: int, winner: int) -> None:
+        """Called with every completed trick, the position in it of this player
+        and of the winner."""
+
+    def pass_cards(self) -> list[Card]:
+        """Remove and return three cards to pass, the highest by default."""
+        cards = sorted(self._hand)[-3:]
+        for card in cards:
+            self._hand.remove(card)
+
+        return cards
 
     @abstractmethod
     def play_card(self, trick: list[Card]) -> Card:
@@ -48,6 +74,26 @@ class RandomPlayer(Player):
 
         return random_card
 
+    def pass_cards(self) -> list[Card]:
+        return [self._hand.pop(random.randrange(len(self._hand))) for _ in range(3)]
+
+
+class ReplayPlayer(Player):
+    """Play cards from a recorded play sequence shared by all four players."""
+
+    def __init__(self, name: str, plays: Iterator[Card]) -> None:
+        super().__init__(name)
+        self._plays = plays
+
+    def play_card(self, trick: list[Card]) -> Card:
+        card = next(self._plays)
+
+        if card not in self.get_valid_cards(trick):
+            raise ValueError(f"{self} cannot play {card} on {trick}.")
+
+        self._hand.remove(card)
+        return card
+
 
 class MinCardPlayer(Player):
     """Always play the minimum card in the hand."""
@@ -151,9 +197,10 @@ class SluffingPlayer(Player):
     
 
 class MCTSNode:
-    def __init__(self, parent=None, action=None):
+    def __init__(self, parent=None, action=None, prior=1.0):
         self.parent = parent
         self.action = action  # Action that led to this state
+        self.prior = prior  # Heuristic probability of the action
         self.children = []
         self.visits = 0
         self.score = 0
@@ -168,16 +215,52 @@ class MCTSNode:
 
 
 class MCTSPlayer(Player):
-    def __init__(self, name: str, iterations: int = 1000, c: float = 1.41) -> None:
+    """Monte Carlo tree search over the cards of the current trick.
+
+    With ``priors`` the root children are weighted by the SluffingPlayer and
+    MinMaxCardPlayer heuristics and selected with PUCT. ``widening`` > 0 only
+    considers the ``widening * sqrt(visits)`` children with the highest prior.
+    ``early_stop`` ends the search once the most visited child can't be
+    overtaken within the remaining iterations; it never changes the chosen
+    card but draws fewer random numbers, so seeded results differ.
+    """
+
+    HEURISTICS = (SluffingPlayer, MinMaxCardPlayer)
+    MAX_POINTS = 26  # Points in a round, used to scale values for PUCT
+
+    def __init__(
+        self,
+        name: str,
+        iterations: int = 1000,
+        c: float = 1.41,
+        priors: bool = False,
+        c_puct: float = 2.0,
+        widening: float = 0.0,
+        early_stop: bool = False,
+    ) -> None:
+        if widening > 0 and not priors:
+            raise ValueError("Progressive widening requires priors to order the cards.")
+
         super().__init__(name)
         self.iterations = iterations
         self.c = c  # Exploration parameter
+        self.priors = priors
+        self.c_puct = c_puct  # Exploration parameter with priors
+        self.widening = widening
+        self.early_stop = early_stop
         self.player_count = 4  # Assuming 4 players in Hearts
         self.played_cards = set()  # Track cards seen so far
+        self.round_points = [0] * self.player_count
         self.all_cards = [Card(suit, rank) for suit in ["♥", "♦", "♠", "♣"] 
                          for rank in ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]]
         
     def play_card(self, trick: list[Card]) -> Card:
+        # Forget the previous round on the first trick of a new one
+        if len(self._hand) == 13:
+            self.played_cards = set()
+            # Points taken this round relative to us: self, left, across, right
+            self.round_points = [0] * self.player_count
+
         # Update knowledge of played cards
         for card in trick:
             self.played_cards.add(card)
@@ -197,13 +280,23 @@ class MCTSPlayer(Player):
         self._hand.remove(best_card)
         self.played_cards.add(best_card)
         return best_card
+
+    def observe_trick(self, trick: list[Card], position: int, winner: int) -> None:
+        """Remember every played card and who took the points"""
+        # The first trick of a round starts from scratch
+        if len(self._hand) == 12:
+            self.played_cards = set()
+            self.round_points = [0] * self.player_count
+
+        self.played_cards.update(trick)
+        self.round_points[(winner - position) % self.player_count] += trick_points(trick)
     
     def run_mcts(self, trick: list[Card], valid_cards: list[Card]) -> Card:
         # Create root node representing current state
         root = MCTSNode()
         
         # Run MCTS for specified number of iterations
-        for _ in range(self.iterations):
+        for iteration in range(self.iterations):
             # Create a game state for this simulation
             game_state = self.create_game_state(trick.copy())
             
@@ -218,6 +311,10 @@ class MCTSPlayer(Player):
             
             # Backpropagate
             self.backpropagate(expanded_node, simulation_result)
+
+            # Stop once the most visited card is decided
+            if self.early_stop and self.is_decided(root, self.iterations - iteration - 1):
+                break
         
         # Choose best card based on statistics
         if not root.children:
@@ -240,21 +337,23 @@ class MCTSPlayer(Player):
         # Calculate the position of MCTS player based on trick length
         mcts_position = len(current_trick)
         
-        # Calculate who leads the trick (important for determining turn order)
-        trick_starter = (4 - len(current_trick)) % 4
+        # Positions are relative to the trick, so the starter is always 0
+        # and it is the MCTS player's turn at the root
+        trick_starter = 0
         
         # Create hands for all players
         hands = [[] for _ in range(self.player_count)]
         hands[mcts_position] = self._hand.copy()  # MCTS player's hand
         
-        # Distribute unknown cards to other players
-        other_positions = [i for i in range(self.player_count) if i != mcts_position]
-        cards_per_player = len(unknown_cards) // len(other_positions)
-        
-        for i, pos in enumerate(other_positions):
-            start_idx = i * cards_per_player
-            end_idx = start_idx + cards_per_player if i < len(other_positions) - 1 else len(unknown_cards)
-            hands[pos] = unknown_cards[start_idx:end_idx]
+        # Distribute unknown cards to other players, who already played in
+        # this trick hold one card less
+        start_idx = 0
+        for pos in range(self.player_count):
+            if pos == mcts_position:
+                continue
+            hand_size = len(self._hand) - (1 if pos < mcts_position else 0)
+            hands[pos] = unknown_cards[start_idx:start_idx + hand_size]
+            start_idx += hand_size
         
         # Create game state
         return {
@@ -263,7 +362,13 @@ class MCTSPlayer(Player):
             'current_player': (trick_starter + len(current_trick)) % self.player_count,
             'hands': hands,
             'mcts_position': mcts_position,
-            'scores': [0] * self.player_count  # Track scores during simulation
+            # Points taken this round so far, for shooting the moon
+            'scores': [
+                self.round_points[(pos - mcts_position) % self.player_count]
+                for pos in range(self.player_count)
+            ],
+            'first_trick': len(self._hand) == 13,
+            'hearts_broken': any(card.suit == "♥" for card in self.played_cards),
         }
     
     def select(self, node):
@@ -281,8 +386,40 @@ class MCTSPlayer(Player):
         # For this implementation, a node is expandable if it has no children
         return len(node.children) == 0
     
+    def is_decided(self, node, remaining_iterations):
+        """Check if the most visited child keeps its lead whatever happens next"""
+        if len(node.children) < 2:
+            return False
+
+        first, second = sorted((child.visits for child in node.children), reverse=True)[:2]
+        return first - second > remaining_iterations
+
+    def widened_children(self, node):
+        """Children open to selection under progressive widening"""
+        if self.widening <= 0:
+            return node.children
+
+        # Children are ordered by prior
+        width = max(1, math.ceil(self.widening * math.sqrt(node.visits)))
+        return node.children[:width]
+
+    def heuristic_priors(self, trick, valid_cards):
+        """Prior of each valid card from the order the heuristics would play them"""
+        weights = {card: 0.0 for card in valid_cards}
+        for heuristic in self.HEURISTICS:
+            player = heuristic(self.name)
+            player.hand = valid_cards.copy()
+            for rank in range(len(valid_cards)):
+                weights[player.play_card(trick)] += 0.5**rank
+
+        total = sum(weights.values())
+        return [weights[card] / total for card in valid_cards]
+
     def select_uct(self, node):
         """Select child with highest UCT value"""
+        if self.priors:
+            return self.select_puct(node)
+
         log_parent_visits = math.log(node.visits + 1)
         
         def uct_score(child):
@@ -294,20 +431,44 @@ class MCTSPlayer(Player):
             exploration = self.c * math.sqrt(log_parent_visits / child.visits)
             return exploitation + exploration
         
-        return max(node.children, key=uct_score)
+        return max(self.widened_children(node), key=uct_score)
+
+    def select_puct(self, node):
+        """Select child with highest PUCT value"""
+        sqrt_parent_visits = math.sqrt(node.visits)
+        # Unvisited children are valued at the parent's mean
+        parent_value = node.score / node.visits / self.MAX_POINTS if node.visits else 0
+
+        def puct_score(child):
+            if child.visits == 0:
+                value = parent_value
+            else:
+                value = child.score / child.visits / self.MAX_POINTS
+            exploration = self.c_puct * child.prior * sqrt_parent_visits / (1 + child.visits)
+            return value + exploration
+
+        return max(self.widened_children(node), key=puct_score)
     
     def expand(self, node, game_state, valid_cards):
         """Expand node by adding a child"""
         # If node has no children yet and is the root (MCTS player's turn)
         if node.parent is None and not node.children and game_state['current_player'] == game_state['mcts_position']:
-            for card in valid_cards:
+            if self.priors:
+                priors = self.heuristic_priors(game_state['current_trick'], valid_cards)
+            else:
+                priors = [1.0] * len(valid_cards)
+
+            for card, prior in zip(valid_cards, priors):
                 action = {'card': card, 'player': game_state['mcts_position']}
-                child = MCTSNode(parent=node, action=action)
+                child = MCTSNode(parent=node, action=action, prior=prior)
                 node.children.append(child)
-            
+
+            # Most promising children first for progressive widening
+            node.children.sort(key=lambda child: child.prior, reverse=True)
+
             # Return a random child to continue simulation
             if node.children:
-                return random.choice(node.children)
+                return random.choice(self.widened_children(node))
                 
         # For non-root nodes or if not MCTS player's turn
         # Just pass through as we'll handle these moves in simulation
@@ -322,7 +483,9 @@ class MCTSPlayer(Player):
             'current_player': game_state['current_player'],
             'hands': [hand.copy() for hand in game_state['hands']],
             'mcts_position': game_state['mcts_position'],
-            'scores': game_state['scores'].copy()
+            'scores': game_state['scores'].copy(),
+            'first_trick': game_state['first_trick'],
+            'hearts_broken': game_state['hearts_broken'],
         }
         
         # Apply the action that got us to this node if it exists
@@ -341,7 +504,8 @@ class MCTSPlayer(Player):
             self.apply_action(sim_state, action)
         
         # Return negative of MCTS player's score (lower is better in Hearts)
-        return -sim_state['scores'][sim_state['mcts_position']]
+        scores = self.rules.score_round(sim_state['scores'])
+        return -scores[sim_state['mcts_position']]
     
     def backpropagate(self, node, result):
         """Update statistics on path back to root"""
@@ -357,22 +521,29 @@ class MCTSPlayer(Player):
         hand = game_state['hands'][current_player]
         
         # Get valid cards based on trick
-        valid_cards = self.get_valid_cards_for_simulation(hand, game_state['current_trick'])
+        valid_cards = self.get_valid_cards_for_simulation(hand, game_state)
         
         # Convert valid cards to actions
         return [{'card': card, 'player': current_player} for card in valid_cards]
     
-    def get_valid_cards_for_simulation(self, hand, trick):
-        """Get valid cards for a hand based on trick"""
-        if not trick:
-            return hand.copy()
-            
-        lead_suit = trick[0].suit
-        valid_cards = [card for card in hand if card.suit == lead_suit]
-        
-        if valid_cards:
-            return valid_cards
-        return hand.copy()
+    def get_valid_cards_for_simulation(self, hand, game_state):
+        """Get valid cards for a hand based on trick and the game rules"""
+        trick = game_state['current_trick']
+        valid_cards = hand
+        if trick:
+            lead_suit = trick[0].suit
+            lead_suit_cards = [card for card in hand if card.suit == lead_suit]
+            if lead_suit_cards:
+                valid_cards = lead_suit_cards
+
+        # Same precomputed masks as the game uses for real plays
+        allowed = self.rules.allowed_masks()[game_state['first_trick']][not trick][game_state['hearts_broken']]
+        if allowed is not None:
+            allowed_cards = [card for card in valid_cards if allowed[card._index]]
+            if allowed_cards:
+                return allowed_cards
+
+        return valid_cards.copy()
     
     def apply_action(self, game_state, action):
         """Apply an action to the game state"""
@@ -381,6 +552,8 @@ class MCTSPlayer(Player):
         
         # Add card to trick
         game_state['current_trick'].append(card)
+        if card.suit == "♥":
+            game_state['hearts_broken'] = True
         
         # Remove card from player's hand
         game_state['hands'][player].remove(card)
@@ -391,25 +564,17 @@ class MCTSPlayer(Player):
         # Check if trick is complete
         if len(game_state['current_trick']) == self.player_count:
             # Determine trick winner
-            lead_suit = game_state['current_trick'][0].suit
-            highest_cards = [c for c in game_state['current_trick'] if c.suit == lead_suit]
-            if highest_cards:
-                highest_card = max(highest_cards)
-                winner_index = game_state['current_trick'].index(highest_card)
-                winner = (game_state['trick_starter'] + winner_index) % self.player_count
-                
-                # Calculate points
-                points = sum(1 for c in game_state['current_trick'] if c.suit == "♥")
-                if Card("♠", "Q") in game_state['current_trick']:
-                    points += 13
-                    
-                # Update score
-                game_state['scores'][winner] += points
-                
-                # Start new trick with winner leading
-                game_state['current_trick'] = []
-                game_state['trick_starter'] = winner
-                game_state['current_player'] = winner
+            winner_index = trick_winner(game_state['current_trick'])
+            winner = (game_state['trick_starter'] + winner_index) % self.player_count
+
+            # Update score
+            game_state['scores'][winner] += trick_points(game_state['current_trick'])
+
+            # Start new trick with winner leading
+            game_state['first_trick'] = False
+            game_state['current_trick'] = []
+            game_state['trick_starter'] = winner
+            game_state['current_player'] = winner
     
     def is_game_over(self, game_state):
         """Check if game is over"""
@@ -0,0 +1,168 @@
+"""Multiplayer Elo ratings of agent variants.
+
+A four player game is scored as the six pairwise matches between its seats,
+where the lower score wins. ``EloRatings.update`` applies one game from its
+pairwise matches, O(players²) and independent of the history, so ratings can
+follow results as workers write them to the ``ResultsStore``. Changing ``k`` or
+``scale`` changes the model key, and the first update under a new key replays
+the whole history one game at a time, as Elo depends on the order of games.
+
+``BatchRatings`` instead fits a Bradley-Terry model to every stored game at
+once with vectorized updates. It is a different model rather than a
+vectorized recompute of Elo, so its ratings are stored under their own key and
+never mixed with Elo updates.
+"""
+
+from hearts.results import ResultsStore
+
+
+def _count_games(games: dict[str, int], results: list[tuple[str, int]]) -> None:
+    # A variant in several seats of one game has still played one game
+    for variant in {variant for variant, _ in results}:
+        games[variant] = games.get(variant, 0) + 1
+
+
+class Ratings:
+    def __init__(self) -> None:
+        self.ratings: dict[str, float] = {}
+        self.games: dict[str, int] = {}
+        self.last_game_id = 0
+
+    def leaderboard(self) -> list[tuple[str, float, int]]:
+        return sorted(
+            ((variant, rating, self.games[variant]) for variant, rating in self.ratings.items()),
+            key=lambda row: row[1],
+            reverse=True,
+        )
+
+
+class EloRatings(Ratings):
+    def __init__(
+        self, k: float = 32.0, scale: float = 400.0, initial: float = 1500.0
+    ) -> None:
+        super().__init__()
+        self.k = k
+        self.scale = scale
+        self.initial = initial
+
+    @property
+    def model(self) -> str:
+        """Key the ratings of these parameters are stored under."""
+        return f"elo k={self.k:g} scale={self.scale:g} initial={self.initial:g}"
+
+    def rating(self, variant: str) -> float:
+        return self.ratings.get(variant, self.initial)
+
+    def update(self, results: list[tuple[str, int]]) -> None:
+        """Apply one game given as ``(variant, score)`` per seat."""
+        ratings = [self.rating(variant) for variant, _ in results]
+        k = self.k / (len(results) - 1)
+
+        deltas = [0.0] * len(results)
+        for i, (_, score) in enumerate(results):
+            for j, (_, other_score) in enumerate(results):
+                if i == j:
+                    continue
+
+                expected = 1 / (1 + 10 ** ((ratings[j] - ratings[i]) / self.scale))
+                actual = 1.0 if score < other_score else 0.5 if score == other_score else 0.0
+                deltas[i] += k * (actual - expected)
+
+        for (variant, _), rating, delta in zip(results, ratings, deltas):
+            self.ratings[variant] = self.ratings.get(variant, rating) + delta
+        _count_games(self.games, results)
+
+    def update_from_store(self, store: ResultsStore) -> int:
+        """Rate the games added to the store since the last update.
+
+        Ratings are loaded from and saved back to the store, so history is
+        never replayed. Returns the number of newly rated games.
+        """
+        self.ratings, self.games, self.last_game_id = store.load_ratings(self.model)
+
+        count = 0
+        for game_id, results in store.game_results(self.last_game_id):
+            self.update(results)
+            self.last_game_id = game_id
+            count += 1
+
+        store.save_ratings(self.model, self.ratings, self.games, self.last_game_id)
+        return count
+
+
+class BatchRatings(Ratings):
+    def __init__(
+        self, scale: float = 400.0, initial: float = 1500.0, iterations: int = 200
+    ) -> None:
+        super().__init__()
+        self.scale = scale
+        self.initial = initial
+        self.iterations = iterations
+
+    @property
+    def model(self) -> str:
+        return f"bradley-terry scale={self.scale:g} initial={self.initial:g}"
+
+    def recompute(self, store: ResultsStore) -> int:
+        """Refit ratings from every game in the store with ``fit_ratings``."""
+        games = list(store.game_results())
+        if not games:
+            return 0
+
+        self.ratings = fit_ratings(
+            [results for _, results in games], self.scale, self.initial, self.iterations
+        )
+        self.games = {}
+        for _, results in games:
+            _count_games(self.games, results)
+        self.last_game_id = games[-1][0]
+
+        store.save_ratings(self.model, self.ratings, self.games, self.last_game_id)
+        return len(games)
+
+
+def fit_ratings(
+    games: list[list[tuple[str, int]]],
+    scale: float = 400.0,
+    initial: float = 1500.0,
+    iterations: int = 200,
+) -> dict[str, float]:
+    """Batch Bradley-Terry fit of the pairwise outcomes of all games.
+
+    Unlike sequential Elo the fit does not depend on the order of the games.
+    Ratings are on the Elo scale with ``initial`` as their mean.
+    """
+    import numpy as np
+
+    variants = sorted({variant for results in games for variant, _ in results})
+    if len(variants) == 1:
+        return {variants[0]: initial}
+
+    index = {variant: i for i, variant in enumerate(variants)}
+    seats = np.array([[index[variant] for variant, _ in results] for results in games])
+    scores = np.array([[score for _, score in results] for results in games])
+
+    # Pairwise wins, ties count half for each side
+    n = len(variants)
+    wins = np.zeros((n, n))
+    for i in range(seats.shape[1]):
+        for j in range(seats.shape[1]):
+            if i != j:
+                outcome = (scores[:, i] < scores[:, j]) + 0.5 * (scores[:, i] == scores[:, j])
+                np.add.at(wins, (seats[:, i], seats[:, j]), outcome)
+
+    # Seats of the same variant don't tell the variants apart
+    np.fill_diagonal(wins, 0)
+
+    # A draw against every other variant keeps unbeaten or winless ratings finite
+    wins += 0.5 * (1 - np.eye(n))
+    matches = wins + wins.T
+    total_wins = wins.sum(axis=1)
+
+    strength = np.ones(n)
+    for _ in range(iterations):
+        strength = total_wins / (matches / (strength[:, None] + strength[None, :])).sum(axis=1)
+        strength /= np.exp(np.log(strength).mean())
+
+    ratings = initial + scale * np.log10(strength)
+    return dict(zip(variants, ratings.tolist()))
@@ -0,0 +1,318 @@
+"""SQLite store of experiment results.
+
+Every game is recorded with its experiment, the config hash and code version it
+was played with, and the agent type and parameters of each seat. Each process
+should open its own ``ResultsStore``; the database runs in WAL mode so parallel
+workers can insert while others read.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+from datetime import datetime, timezone
+from typing import Iterator
+
+DEFAULT_PATH = "results/results.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    config TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    code_version TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    experiment_id INTEGER NOT NULL REFERENCES experiments(id),
+    game_name TEXT NOT NULL,
+    played_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seat INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    params TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (game_id, seat)
+);
+CREATE INDEX IF NOT EXISTS experiments_name ON experiments(name);
+CREATE INDEX IF NOT EXISTS experiments_config_hash ON experiments(config_hash);
+CREATE INDEX IF NOT EXISTS experiments_created_at ON experiments(created_at);
+CREATE INDEX IF NOT EXISTS games_experiment_id ON games(experiment_id);
+CREATE INDEX IF NOT EXISTS games_played_at ON games(played_at);
+CREATE INDEX IF NOT EXISTS players_agent ON players(agent, game_id);
+CREATE TABLE IF NOT EXISTS ratings (
+    model TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    rating REAL NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (model, variant)
+);
+CREATE TABLE IF NOT EXISTS rating_progress (
+    model TEXT PRIMARY KEY,
+    last_game_id INTEGER NOT NULL
+);
+"""
+
+
+def config_hash(config: dict) -> str:
+    """Stable hash of an experiment config."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def code_version() -> str:
+    """Git commit of the working tree, suffixed ``-dirty`` if it has
+    uncommitted changes, or the package version outside git."""
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(__file__),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            return version("hearts")
+        except PackageNotFoundError:
+            return "unknown"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+class ResultsStore:
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_experiment(self, config: dict, version: str | None = None) -> int:
+        """Record an experiment config and return its id."""
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO experiments "
+                "(name, config_hash, config, seed, code_version, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    config["name"],
+                    config_hash(config),
+                    json.dumps(config, sort_keys=True),
+                    config["seed"],
+                    version or code_version(),
+                    _now(),
+                ),
+            )
+        return cursor.lastrowid
+
+    def add_game(
+        self,
+        experiment_id: int,
+        players: list[dict],
+        game_name: str,
+        player_scores: list[dict],
+        played_at: str | None = None,
+    ) -> int:
+        """Insert one finished game and return its id.
+
+        ``players`` are the player configs of the experiment and
+        ``player_scores`` the ``Game.play`` results, both in seat order.
+        """
+        with self._connection:
+            return self._insert_game(
+                experiment_id, players, game_name, player_scores, played_at or _now()
+            )
+
+    def add_games(
+        self,
+        experiment_id: int,
+        players: list[dict],
+        games: list[tuple[str, list[dict], str]],
+    ) -> None:
+        """Insert ``(game_name, player_scores, played_at)`` games in one transaction."""
+        with self._connection:
+            for game_name, player_scores, played_at in games:
+                self._insert_game(
+                    experiment_id, players, game_name, player_scores, played_at
+                )
+
+    def _insert_game(
+        self,
+        experiment_id: int,
+        players: list[dict],
+        game_name: str,
+        player_scores: list[dict],
+        played_at: str,
+    ) -> int:
+        cursor = self._connection.execute(
+            "INSERT INTO games (experiment_id, game_name, played_at) VALUES (?, ?, ?)",
+            (experiment_id, game_name, played_at),
+        )
+
+        # Seats by position, player names need not be unique
+        ranked = sorted(range(len(player_scores)), key=lambda seat: player_scores[seat]["score"])
+        player_rows = []
+        for rank, seat in enumerate(ranked, start=1):
+            spec = players[seat]
+            params = {k: v for k, v in spec.items() if k not in ("type", "name")}
+            player_rows.append(
+                (
+                    cursor.lastrowid,
+                    seat,
+                    player_scores[seat]["player"],
+                    spec["type"],
+                    json.dumps(params, sort_keys=True),
+                    player_scores[seat]["score"],
+                    rank,
+                )
+            )
+        self._connection.executemany(
+            "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?)", player_rows
+        )
+        return cursor.lastrowid
+
+    def games(
+        self,
+        agent: str | None = None,
+        opponent: str | None = None,
+        experiment: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        **min_params: float,
+    ) -> list[dict]:
+        """Per-player results of matching games.
+
+        ``min_params`` are lower bounds on agent parameters, e.g. all games
+        where MCTS with at least 2000 iterations faced Sluffing:
+
+            store.games(agent="mcts", opponent="sluffing", iterations=2000)
+        """
+        query = (
+            "SELECT g.id AS game_id, g.game_name, e.name AS experiment, "
+            "e.config_hash, e.code_version, g.played_at, p.seat, p.name, "
+            "p.agent, p.params, p.score, p.rank "
+            "FROM players p "
+            "JOIN games g ON g.id = p.game_id "
+            "JOIN experiments e ON e.id = g.experiment_id"
+        )
+        conditions = []
+        parameters: list = []
+
+        if agent is not None:
+            conditions.append("p.agent = ?")
+            parameters.append(agent)
+
+        for key, value in min_params.items():
+            conditions.append("json_extract(p.params, ?) >= ?")
+            parameters.extend((f"$.{key}", value))
+
+        if opponent is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM players o WHERE o.game_id = p.game_id "
+                "AND o.seat != p.seat AND o.agent = ?)"
+            )
+            parameters.append(opponent)
+
+        if experiment is not None:
+            conditions.append("e.name = ?")
+            parameters.append(experiment)
+
+        if since is not None:
+            conditions.append("g.played_at >= ?")
+            parameters.append(since)
+
+        if until is not None:
+            conditions.append("g.played_at < ?")
+            parameters.append(until)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        rows = self._connection.execute(query + " ORDER BY g.id, p.seat", parameters)
+        return [dict(row) for row in rows]
+
+    def game_results(
+        self, after_game_id: int = 0
+    ) -> Iterator[tuple[int, list[tuple[str, int]]]]:
+        """Yield ``(game_id, [(variant, score), ...])`` for games after an id.
+
+        A variant is the agent type followed by its parameters, if any.
+        """
+        rows = self._connection.execute(
+            "SELECT game_id, agent, params, score FROM players "
+            "WHERE game_id > ? ORDER BY game_id, seat",
+            (after_game_id,),
+        )
+        game_id, results = None, []
+        for row in rows:
+            if row["game_id"] != game_id and results:
+                yield game_id, results
+                results = []
+
+            game_id = row["game_id"]
+            params = row["params"]
+            variant = row["agent"] if params == "{}" else f"{row['agent']} {params}"
+            results.append((variant, row["score"]))
+
+        if results:
+            yield game_id, results
+
+    def load_ratings(self, model: str) -> tuple[dict[str, float], dict[str, int], int]:
+        """Ratings, game counts and last rated game id stored for a model."""
+        rows = self._connection.execute(
+            "SELECT variant, rating, games FROM ratings WHERE model = ?", (model,)
+        ).fetchall()
+        progress = self._connection.execute(
+            "SELECT last_game_id FROM rating_progress WHERE model = ?", (model,)
+        ).fetchone()
+
+        return (
+            {row["variant"]: row["rating"] for row in rows},
+            {row["variant"]: row["games"] for row in rows},
+            progress["last_game_id"] if progress else 0,
+        )
+
+    def save_ratings(
+        self,
+        model: str,
+        ratings: dict[str, float],
+        games: dict[str, int],
+        last_game_id: int,
+    ) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO ratings VALUES (?, ?, ?, ?)",
+                [
+                    (model, variant, rating, games[variant])
+                    for variant, rating in ratings.items()
+                ],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO rating_progress VALUES (?, ?)",
+                (model, last_game_id),
+            )
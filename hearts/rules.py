@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from functools import cache
+from typing import Self
+
+from hearts.card import SUITS, Card
+
+ALL_CARDS = (1 << 52) - 1
+HEARTS = ((1 << 13) - 1) << (SUITS.index("♥") * 13)
+QUEEN_OF_SPADES = 1 << Card("♠", "Q").index
+TWO_OF_CLUBS = 1 << Card("♣", "2").index
+POINT_CARDS = HEARTS | QUEEN_OF_SPADES
+
+
+def lookup(mask: int) -> tuple[bool, ...]:
+    """Bit mask as a tuple indexed by card index, faster to test than bits."""
+    return tuple(bool(mask >> i & 1) for i in range(52))
+
+
+_TWO_OF_CLUBS_LOOKUP = lookup(TWO_OF_CLUBS)
+_NO_POINTS_LOOKUP = lookup(ALL_CARDS & ~POINT_CARDS)
+_NO_HEARTS_LOOKUP = lookup(ALL_CARDS & ~HEARTS)
+_POINTS = tuple(
+    13 * bool(QUEEN_OF_SPADES >> i & 1) + bool(HEARTS >> i & 1) for i in range(52)
+)
+
+
+def trick_points(trick: list[Card]) -> int:
+    """Points in a trick, one per heart and 13 for the Q♠."""
+    return sum(_POINTS[card._index] for card in trick)
+
+
+def trick_winner(trick: list[Card]) -> int:
+    """Position within the trick of the card that takes it."""
+    # Card indices are ordered by suit then value
+    ids = [card._index for card in trick]
+    lead_suit = ids[0] // 13
+    max_card_index = 0
+    for i, id in enumerate(ids):
+        if id // 13 == lead_suit and id > ids[max_card_index]:
+            max_card_index = i
+
+    return max_card_index
+
+# Seat offset to pass to, cycling left, right, across and hold
+PASS_OFFSETS = (1, 3, 2, 0)
+
+
+@dataclass(frozen=True)
+class Rules:
+    """Optional rules on top of the simplified game.
+
+    passing: pass three cards left, right, across, then hold.
+    two_of_clubs_leads: the 2♣ opens each round and no points may be
+        discarded on the first trick.
+    hearts_breaking: hearts can't be led until a heart has been played.
+    shoot_the_moon: taking all 26 points gives every other player 26.
+    """
+
+    passing: bool = False
+    two_of_clubs_leads: bool = False
+    hearts_breaking: bool = False
+    shoot_the_moon: bool = False
+
+    @classmethod
+    def full(cls) -> "Self":
+        return cls(True, True, True, True)
+
+    def to_flags(self) -> int:
+        return (
+            self.passing
+            | self.two_of_clubs_leads << 1
+            | self.hearts_breaking << 2
+            | self.shoot_the_moon << 3
+        )
+
+    @classmethod
+    def from_flags(cls, flags: int) -> "Self":
+        return cls(*(bool(flags >> i & 1) for i in range(4)))
+
+    def score_round(self, round_scores: list[int]) -> list[int]:
+        """Game points for the points each player took in a round."""
+        if self.shoot_the_moon and max(round_scores) == 26:
+            return [0 if score == 26 else 26 for score in round_scores]
+
+        return round_scores
+
+    @cache
+    def allowed_masks(self) -> tuple:
+        """Cards allowed beyond following suit as ``lookup`` tables, indexed by
+        ``[first_trick][leading][hearts_broken]``.
+
+        ``None`` means no restriction. A player with no allowed valid card may
+        play any valid card.
+        """
+
+        def mask(first_trick: bool, leading: bool, hearts_broken: bool) -> tuple | None:
+            if first_trick and self.two_of_clubs_leads:
+                return _TWO_OF_CLUBS_LOOKUP if leading else _NO_POINTS_LOOKUP
+            if leading and self.hearts_breaking and not hearts_broken:
+                return _NO_HEARTS_LOOKUP
+            return None
+
+        return tuple(
+            tuple(
+                tuple(mask(first_trick, leading, hearts_broken) for hearts_broken in (False, True))
+                for leading in (False, True)
+            )
+            for first_trick in (False, True)
+        )
@@ -0,0 +1,349 @@
+"""Compact binary encoding of rounds and game snapshots.
+
+A round is stored as a fixed 59 byte record:
+
+    deal         29 bytes  rank of the 52 card deal permutation (Lehmer code)
+    passes        6 bytes  mixed radix index of each passed card into the hand
+    plays        17 bytes  mixed radix index of each play into the player's hand
+    play count    1 byte   number of cards played so far (multiple of 4)
+    lead          1 byte   index of the player leading the first trick
+    rules         1 byte   ``Rules.to_flags`` and the pass offset in bits 4-5
+    round scores  4 bytes  points taken by each player, before shooting the moon
+
+The deal is the one before passing. Plays are stored as positions in the
+remaining hand rather than card ids. On trick ``t`` every player holds
+``13 - t`` cards, so the radices are known up front and the whole play
+sequence of a round fits in 130 bits.
+"""
+
+import struct
+from dataclasses import dataclass, field
+from math import factorial
+from typing import BinaryIO, Iterator, Self
+
+from hearts.card import SUITS, VALUES, Card
+from hearts.rules import Rules, trick_winner
+
+CARDS = tuple(Card(suit, value) for suit in SUITS for value in VALUES)
+
+_PLAY_RADICES = tuple(13 - i // 4 for i in range(52))
+_PASS_RADICES = (13, 12, 11) * 4
+
+DEAL_SIZE = (factorial(52).bit_length() + 7) // 8
+PASSES_SIZE = (((13 * 12 * 11) ** 4).bit_length() + 7) // 8
+PLAYS_SIZE = ((factorial(13) ** 4).bit_length() + 7) // 8
+RECORD_SIZE = DEAL_SIZE + PASSES_SIZE + PLAYS_SIZE + 7
+
+ROUND_LOG_MAGIC = b"HRTL"
+SNAPSHOT_MAGIC = b"HRTS"
+ROUND_LOG_VERSION = 2
+SNAPSHOT_VERSION = 3
+
+_RECORD_TAIL = struct.Struct("<BBB4B")
+_LOG_HEADER = struct.Struct("<4sB")
+_SNAPSHOT_HEADER = struct.Struct("<4sBBBHBH4H")
+_RNG_STATE = struct.Struct("<625I?d")
+
+
+def encode_deal(hands: list[list[Card]]) -> bytes:
+    """Encode four 13 card hands as the rank of their deal permutation."""
+    remaining = list(range(52))
+    rank = 0
+    for card in (card for hand in hands for card in hand):
+        position = remaining.index(card.index)
+        rank = rank * len(remaining) + position
+        del remaining[position]
+
+    return rank.to_bytes(DEAL_SIZE, "big")
+
+
+def decode_deal(data: bytes) -> list[list[Card]]:
+    """Inverse of ``encode_deal``."""
+    rank = int.from_bytes(data, "big")
+    positions = []
+    for radix in range(1, 53):
+        rank, position = divmod(rank, radix)
+        positions.append(position)
+
+    remaining = list(range(52))
+    deal = [CARDS[remaining.pop(position)] for position in reversed(positions)]
+    return [deal[i : i + 13] for i in range(0, 52, 13)]
+
+
+def encode_passes(hands: list[list[Card]], passes: list[list[Card]]) -> bytes:
+    """Encode the three cards each player passed as positions in their hand."""
+    value = 0
+    for hand, cards in zip(hands, passes):
+        hand = [card.index for card in hand]
+        for radix, card in zip((13, 12, 11), cards):
+            position = hand.index(card.index)
+            value = value * radix + position
+            del hand[position]
+
+    return value.to_bytes(PASSES_SIZE, "big")
+
+
+def decode_passes(data: bytes, hands: list[list[Card]]) -> list[list[Card]]:
+    """Inverse of ``encode_passes``."""
+    value = int.from_bytes(data, "big")
+    positions = []
+    for radix in reversed(_PASS_RADICES):
+        value, position = divmod(value, radix)
+        positions.append(position)
+    positions.reverse()
+
+    passes = []
+    for i, hand in enumerate(hands):
+        hand = hand.copy()
+        passes.append([hand.pop(position) for position in positions[3 * i : 3 * i + 3]])
+
+    return passes
+
+
+def encode_plays(
+    hands: list[list[Card]], plays: list[Card], lead_player_index: int
+) -> bytes:
+    """Encode a play sequence as positions in the dealt hands."""
+    hands = [[card.index for card in hand] for hand in hands]
+    value = 0
+    for i, card in enumerate(plays):
+        if i % 4 == 0:
+            trick_start = i
+        player_index = (lead_player_index + i - trick_start) % 4
+        position = hands[player_index].index(card.index)
+        value = value * _PLAY_RADICES[i] + position
+        del hands[player_index][position]
+
+        if i % 4 == 3:
+            winner = trick_winner(plays[trick_start : i + 1])
+            lead_player_index = (lead_player_index + winner) % 4
+
+    return value.to_bytes(PLAYS_SIZE, "big")
+
+
+def decode_plays(
+    data: bytes, hands: list[list[Card]], lead_player_index: int, count: int
+) -> list[Card]:
+    """Inverse of ``encode_plays`` for the first ``count`` plays."""
+    value = int.from_bytes(data, "big")
+    positions = []
+    for radix in reversed(_PLAY_RADICES[:count]):
+        value, position = divmod(value, radix)
+        positions.append(position)
+    positions.reverse()
+
+    hands = [hand.copy() for hand in hands]
+    plays: list[Card] = []
+    for i, position in enumerate(positions):
+        if i % 4 == 0:
+            trick_start = i
+        player_index = (lead_player_index + i - trick_start) % 4
+        plays.append(hands[player_index].pop(position))
+
+        if i % 4 == 3:
+            winner = trick_winner(plays[trick_start:])
+            lead_player_index = (lead_player_index + winner) % 4
+
+    return plays
+
+
+@dataclass
+class RoundRecord:
+    """Deal, passes and play sequence of a (possibly unfinished) round.
+
+    ``hands`` are dealt before passing, each player passes ``passes[i]`` to
+    the player ``pass_offset`` seats on.
+    """
+
+    hands: list[list[Card]]
+    plays: list[Card]
+    lead_player_index: int
+    round_scores: list[int] = field(default_factory=lambda: [0] * 4)
+    rules: Rules = field(default_factory=Rules)
+    passes: list[list[Card]] = field(default_factory=lambda: [[] for _ in range(4)])
+    pass_offset: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return len(self.plays) == 52
+
+    @property
+    def scores(self) -> list[int]:
+        """Game points of the round, after shooting the moon."""
+        return self.rules.score_round(self.round_scores)
+
+    def played_hands(self) -> list[list[Card]]:
+        """Hands after passing, as the round was played."""
+        hands = [hand.copy() for hand in self.hands]
+        if self.pass_offset == 0:
+            return hands
+
+        for hand, cards in zip(hands, self.passes):
+            for card in cards:
+                hand.remove(card)
+        for i, cards in enumerate(self.passes):
+            hands[(i + self.pass_offset) % 4].extend(cards)
+
+        return hands
+
+    def to_bytes(self) -> bytes:
+        if len(self.plays) % 4 != 0:
+            raise ValueError("Rounds can only be encoded between tricks.")
+
+        if self.pass_offset == 0:
+            passes = bytes(PASSES_SIZE)
+        else:
+            passes = encode_passes(self.hands, self.passes)
+
+        return (
+            encode_deal(self.hands)
+            + passes
+            + encode_plays(self.played_hands(), self.plays, self.lead_player_index)
+            + _RECORD_TAIL.pack(
+                len(self.plays),
+                self.lead_player_index,
+                self.rules.to_flags() | self.pass_offset << 4,
+                *self.round_scores,
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Self":
+        if len(data) != RECORD_SIZE:
+            raise ValueError(f"Expected {RECORD_SIZE} bytes, got {len(data)}.")
+
+        plays_start = DEAL_SIZE + PASSES_SIZE
+        count, lead_player_index, flags, *round_scores = _RECORD_TAIL.unpack_from(
+            data, plays_start + PLAYS_SIZE
+        )
+        record = cls(
+            hands=decode_deal(data[:DEAL_SIZE]),
+            plays=[],
+            lead_player_index=lead_player_index,
+            round_scores=round_scores,
+            rules=Rules.from_flags(flags & 0xF),
+            pass_offset=flags >> 4,
+        )
+        if record.pass_offset != 0:
+            record.passes = decode_passes(data[DEAL_SIZE:plays_start], record.hands)
+
+        record.plays = decode_plays(
+            data[plays_start : plays_start + PLAYS_SIZE],
+            record.played_hands(),
+            lead_player_index,
+            count,
+        )
+        return record
+
+
+@dataclass
+class GameSnapshot:
+    """Everything needed to resume a ``Game`` between tricks.
+
+    Player internals are not part of the snapshot. ``Game.from_snapshot``
+    shows the players the tricks already played in the round instead, which
+    is all an ``MCTSPlayer`` remembers.
+    """
+
+    max_points: int
+    scores: list[int]
+    lead_player_index: int
+    round_index: int = 0
+    rules: Rules = field(default_factory=Rules)
+    round: RoundRecord | None = None
+    rng_state: tuple | None = None
+
+    def to_bytes(self) -> bytes:
+        flags = (self.round is not None) | (self.rng_state is not None) << 1
+        data = _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            flags,
+            self.rules.to_flags(),
+            self.max_points,
+            self.lead_player_index,
+            self.round_index,
+            *self.scores,
+        )
+        if self.round is not None:
+            data += self.round.to_bytes()
+        if self.rng_state is not None:
+            _, state, gauss_next = self.rng_state
+            data += _RNG_STATE.pack(
+                *state, gauss_next is not None, gauss_next or 0.0
+            )
+
+        return data
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Self":
+        if len(data) < _SNAPSHOT_HEADER.size:
+            raise ValueError("Not a game snapshot.")
+
+        (
+            magic,
+            version,
+            flags,
+            rules,
+            max_points,
+            lead_player_index,
+            round_index,
+            *scores,
+        ) = _SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Not a game snapshot.")
+
+        offset = _SNAPSHOT_HEADER.size
+        round = None
+        if flags & 1:
+            round = RoundRecord.from_bytes(data[offset : offset + RECORD_SIZE])
+            offset += RECORD_SIZE
+
+        rng_state = None
+        if flags & 2:
+            *state, has_gauss, gauss_next = _RNG_STATE.unpack_from(data, offset)
+            rng_state = (3, tuple(state), gauss_next if has_gauss else None)
+
+        return cls(
+            max_points,
+            scores,
+            lead_player_index,
+            round_index,
+            Rules.from_flags(rules),
+            round,
+            rng_state,
+        )
+
+
+class RoundLogWriter:
+    """Append ``RoundRecord``s to a binary round log."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        if file.tell() == 0:
+            file.write(_LOG_HEADER.pack(ROUND_LOG_MAGIC, ROUND_LOG_VERSION))
+
+    def write(self, record: RoundRecord) -> None:
+        if not record.complete:
+            raise ValueError("Only complete rounds can be logged.")
+
+        self._file.write(record.to_bytes())
+
+
+def read_round_log(file: BinaryIO) -> Iterator[RoundRecord]:
+    """Yield every record of a round log written by ``RoundLogWriter``."""
+    header = file.read(_LOG_HEADER.size)
+    if len(header) < _LOG_HEADER.size:
+        raise ValueError("Not a round log.")
+
+    magic, version = _LOG_HEADER.unpack(header)
+    if magic != ROUND_LOG_MAGIC or version != ROUND_LOG_VERSION:
+        raise ValueError("Not a round log.")
+
+    while chunk := file.read(RECORD_SIZE * 4096):
+        if len(chunk) % RECORD_SIZE != 0:
+            raise ValueError("Truncated round log.")
+
+        view = memoryview(chunk)
+        for offset in range(0, len(chunk), RECORD_SIZE):
+            yield RoundRecord.from_bytes(view[offset : offset + RECORD_SIZE])
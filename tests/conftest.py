@@ -0,0 +1,14 @@
+import pytest
+
+from hearts.results import ResultsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        yield store
+
+
+@pytest.fixture
+def experiment_id(store):
+    return store.add_experiment({"name": "test", "seed": 0}, version="test")
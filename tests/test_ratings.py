@@ -0,0 +1,107 @@
+import pytest
+
+from hearts.ratings import BatchRatings, EloRatings, fit_ratings
+
+PLAYERS = [
+    {"type": "mcts", "name": "MCTS", "iterations": 100},
+    {"type": "sluffing", "name": "Sluffing"},
+    {"type": "random", "name": "Random"},
+    {"type": "random", "name": "Random"},
+]
+
+
+def add_games(store, experiment_id, scores: list[list[int]]) -> None:
+    for i, game_scores in enumerate(scores):
+        store.add_game(
+            experiment_id,
+            PLAYERS,
+            f"game {i}",
+            [
+                {"player": player["name"], "score": score}
+                for player, score in zip(PLAYERS, game_scores)
+            ],
+        )
+
+
+def test_elo_update_pairwise():
+    elo = EloRatings(k=32)
+    elo.update([("a", 0), ("b", 10), ("c", 20), ("d", 30)])
+
+    # Each seat plays three matches worth k / 3, expected to win half of them
+    assert elo.ratings["a"] == pytest.approx(1516)
+    assert elo.ratings["b"] == pytest.approx(1500 + 32 / 3 * 0.5)
+    assert elo.ratings["c"] == pytest.approx(1500 - 32 / 3 * 0.5)
+    assert elo.ratings["d"] == pytest.approx(1484)
+    assert sum(elo.ratings.values()) == pytest.approx(4 * 1500)
+
+
+def test_elo_update_ties():
+    elo = EloRatings()
+    elo.update([("a", 5), ("b", 5), ("c", 5), ("d", 5)])
+    assert all(rating == pytest.approx(1500) for rating in elo.ratings.values())
+
+
+def test_games_counted_once_per_variant():
+    elo = EloRatings()
+    elo.update([("a", 0), ("b", 10), ("c", 20), ("c", 30)])
+    elo.update([("a", 0), ("b", 10), ("c", 20), ("c", 30)])
+
+    assert elo.games == {"a": 2, "b": 2, "c": 2}
+    assert [variant for variant, _, _ in elo.leaderboard()] == ["a", "b", "c"]
+
+
+def test_fit_ratings():
+    games = [[("a", 0), ("b", 10), ("c", 20), ("c", 30)]] * 3 + [
+        [("b", 0), ("a", 10), ("c", 20), ("c", 30)]
+    ]
+    ratings = fit_ratings(games)
+
+    assert ratings["a"] > ratings["b"] > ratings["c"]
+    assert sum(ratings.values()) / len(ratings) == pytest.approx(1500)
+    # Unlike Elo the order of the games doesn't matter
+    assert fit_ratings(games[::-1]) == pytest.approx(ratings)
+
+
+def test_fit_ratings_single_variant():
+    assert fit_ratings([[("a", 0), ("a", 10), ("a", 20), ("a", 30)]]) == {"a": 1500}
+
+
+def test_update_from_store_resumes(store, experiment_id):
+    scores = [[0, 10, 20, 30], [30, 0, 10, 20], [0, 20, 10, 30], [10, 0, 30, 20], [0, 5, 6, 15]]
+    add_games(store, experiment_id, scores[:3])
+    assert EloRatings().update_from_store(store) == 3
+
+    add_games(store, experiment_id, scores[3:])
+    elo = EloRatings()
+    assert elo.update_from_store(store) == 2
+    assert elo.update_from_store(store) == 0
+
+    # Same as rating the whole history at once
+    expected = EloRatings()
+    for _, results in store.game_results():
+        expected.update(results)
+    assert elo.ratings == pytest.approx(expected.ratings)
+    assert elo.games == expected.games == {
+        'mcts {"iterations": 100}': 5,
+        "sluffing": 5,
+        "random": 5,
+    }
+    assert elo.last_game_id == 5
+
+
+def test_models_stored_separately(store, experiment_id):
+    add_games(store, experiment_id, [[0, 10, 20, 30], [30, 0, 10, 20]])
+    EloRatings(k=32).update_from_store(store)
+    batch = BatchRatings()
+    assert batch.recompute(store) == 2
+
+    elo_ratings, _, _ = store.load_ratings(EloRatings(k=32).model)
+    batch_ratings, games, last_game_id = store.load_ratings(batch.model)
+    assert batch_ratings == pytest.approx(batch.ratings)
+    assert batch_ratings != pytest.approx(elo_ratings)
+    assert games["random"] == 2
+    assert last_game_id == 2
+
+    # A new Elo model starts from the full history
+    assert store.load_ratings(EloRatings(k=16).model) == ({}, {}, 0)
+    assert EloRatings(k=16).update_from_store(store) == 2
@@ -0,0 +1,86 @@
+from hearts.results import config_hash
+
+
+def players(*specs: tuple[str, str, dict]) -> list[dict]:
+    return [{"type": agent, "name": name, **params} for agent, name, params in specs]
+
+
+def scores(players: list[dict], scores: list[int]) -> list[dict]:
+    return [{"player": player["name"], "score": score} for player, score in zip(players, scores)]
+
+
+MIXED = players(
+    ("mcts", "MCTS", {"iterations": 1000}),
+    ("random", "Random", {}),
+    ("sluffing", "Sluffing", {}),
+    ("random", "Random", {}),
+)
+
+
+def test_add_game_seats_by_position(store, experiment_id):
+    game_id = store.add_game(experiment_id, MIXED, "game 1", scores(MIXED, [40, 100, 12, 40]))
+
+    rows = store.games()
+    assert [row["game_id"] for row in rows] == [game_id] * 4
+    assert [(row["seat"], row["name"], row["agent"]) for row in rows] == [
+        (0, "MCTS", "mcts"),
+        (1, "Random", "random"),
+        (2, "Sluffing", "sluffing"),
+        (3, "Random", "random"),
+    ]
+    # Duplicate names keep their own seat's score, ties rank by seat
+    assert [row["score"] for row in rows] == [40, 100, 12, 40]
+    assert [row["rank"] for row in rows] == [2, 4, 1, 3]
+    assert rows[0]["params"] == '{"iterations": 1000}'
+    assert rows[1]["params"] == "{}"
+
+
+def test_add_games_keeps_timestamps(store, experiment_id):
+    store.add_games(
+        experiment_id,
+        MIXED,
+        [
+            ("game 1", scores(MIXED, [10, 20, 30, 100]), "2026-01-01T00:00:00.000+00:00"),
+            ("game 2", scores(MIXED, [100, 30, 20, 10]), "2026-01-02T00:00:00.000+00:00"),
+        ],
+    )
+
+    rows = store.games(agent="mcts")
+    assert [(row["game_name"], row["played_at"], row["rank"]) for row in rows] == [
+        ("game 1", "2026-01-01T00:00:00.000+00:00", 1),
+        ("game 2", "2026-01-02T00:00:00.000+00:00", 4),
+    ]
+    assert store.games(since="2026-01-02")[0]["game_name"] == "game 2"
+    assert {row["game_name"] for row in store.games(until="2026-01-02")} == {"game 1"}
+
+
+def test_games_filter(store):
+    configs = [
+        ("weak", players(("mcts", "MCTS", {"iterations": 1000}), ("sluffing", "Sluffing", {}))),
+        ("strong", players(("mcts", "MCTS", {"iterations": 3000}), ("sluffing", "Sluffing", {}))),
+        ("random", players(("mcts", "MCTS", {"iterations": 3000}), ("random", "Random", {}))),
+    ]
+    for name, config_players in configs:
+        experiment_id = store.add_experiment({"name": name, "seed": 0}, version="test")
+        store.add_game(experiment_id, config_players, "game 1", scores(config_players, [10, 20]))
+
+    rows = store.games(agent="mcts", opponent="sluffing", iterations=2000)
+    assert [(row["experiment"], row["agent"]) for row in rows] == [("strong", "mcts")]
+    assert rows[0]["config_hash"] == config_hash({"name": "strong", "seed": 0})
+
+    assert len(store.games(agent="mcts", iterations=2000)) == 2
+    assert len(store.games(opponent="mcts")) == 3
+    assert len(store.games(experiment="weak")) == 2
+
+
+def test_game_results_grouping(store, experiment_id):
+    first = store.add_game(experiment_id, MIXED, "game 1", scores(MIXED, [1, 2, 3, 4]))
+    second = store.add_game(experiment_id, MIXED, "game 2", scores(MIXED, [5, 6, 7, 8]))
+
+    variants = ['mcts {"iterations": 1000}', "random", "sluffing", "random"]
+    assert list(store.game_results()) == [
+        (first, list(zip(variants, [1, 2, 3, 4]))),
+        (second, list(zip(variants, [5, 6, 7, 8]))),
+    ]
+    assert list(store.game_results(first)) == [(second, list(zip(variants, [5, 6, 7, 8])))]
+    assert list(store.game_results(second)) == []
@@ -0,0 +1,100 @@
+import pytest
+
+from hearts.card import Card
+from hearts.game import Game
+from hearts.players import MinCardPlayer
+from hearts.rules import Rules, trick_points, trick_winner
+from hearts.snapshot import CARDS
+
+
+def cards(text: str) -> list[Card]:
+    return [Card(card[-1], card[:-1]) for card in text.split()]
+
+
+def valid_cards(
+    hand: str,
+    trick: str = "",
+    first_trick: bool = False,
+    hearts_broken: bool = False,
+    rules: Rules = Rules.full(),
+) -> list[Card]:
+    player = MinCardPlayer("Player")
+    player.hand = cards(hand)
+    trick = cards(trick)
+    player.allowed_cards = rules.allowed_masks()[first_trick][not trick][hearts_broken]
+    return player.get_valid_cards(trick)
+
+
+def test_two_of_clubs_opens_first_trick():
+    assert valid_cards("5♦ 2♣ 9♠", first_trick=True) == cards("2♣")
+    assert valid_cards("5♦ 2♣ 9♠", first_trick=True, rules=Rules()) == cards("5♦ 2♣ 9♠")
+
+
+def test_two_of_clubs_holder_leads():
+    players = [MinCardPlayer(f"Player {i + 1}") for i in range(4)]
+    game = Game(players, print_scores=False, rules=Rules(two_of_clubs_leads=True))
+    hands = [list(CARDS[i : i + 13]) for i in range(0, 52, 13)]
+    game.deal(hands)
+
+    assert Card("♣", "2") in players[game.lead_player_index].hand
+    assert game.lead_player_index == 2
+
+
+def test_no_points_on_first_trick():
+    assert valid_cards("3♥ Q♠ 5♦", "2♣", first_trick=True) == cards("5♦")
+    assert valid_cards("3♥ Q♠ 5♦", "2♣") == cards("3♥ Q♠ 5♦")
+    # Nothing but points to discard
+    assert valid_cards("3♥ Q♠", "2♣", first_trick=True) == cards("3♥ Q♠")
+
+
+def test_hearts_led_once_broken():
+    assert valid_cards("3♥ 5♦ 9♠") == cards("5♦ 9♠")
+    assert valid_cards("3♥ 5♦ 9♠", hearts_broken=True) == cards("3♥ 5♦ 9♠")
+    # Only hearts left to lead
+    assert valid_cards("3♥ 7♥") == cards("3♥ 7♥")
+    # Following may always play hearts
+    assert valid_cards("3♥ 9♠", "5♦") == cards("3♥ 9♠")
+
+
+@pytest.mark.parametrize(
+    ("rules", "scores"),
+    [(Rules(), [26, 0, 0, 0]), (Rules(shoot_the_moon=True), [0, 26, 26, 26])],
+)
+def test_shoot_the_moon(rules, scores):
+    assert rules.score_round([26, 0, 0, 0]) == scores
+    assert rules.score_round([20, 6, 0, 0]) == [20, 6, 0, 0]
+
+
+def test_trick_points_and_winner():
+    assert trick_points(cards("2♣ 3♥ Q♠ A♥")) == 15
+    assert trick_points(cards("2♣ 3♦ K♠ A♣")) == 0
+    # Highest card of the led suit, whatever is played off suit
+    assert trick_winner(cards("5♦ A♠ 9♦ 2♦")) == 2
+    assert trick_winner(cards("10♣ J♣ 2♣ A♥")) == 1
+
+
+def test_pass_direction_cycle():
+    players = [MinCardPlayer(f"Player {i + 1}") for i in range(4)]
+    game = Game(players, print_scores=False, rules=Rules(passing=True))
+    hands = [list(CARDS[i : i + 13]) for i in range(0, 52, 13)]
+
+    offsets = []
+    for round_index in range(5):
+        game.round_index = round_index
+        game.deal(hands)
+        offsets.append(game.pass_offset)
+
+        for i, passed in enumerate(game.passed_cards):
+            if game.pass_offset == 0:
+                assert passed == []
+                assert players[i].hand == hands[i]
+                continue
+
+            # Players pass their three highest cards by default
+            assert passed == hands[i][-3:]
+            receiver = players[(i + game.pass_offset) % 4]
+            assert all(card in receiver.hand for card in passed)
+            assert not any(card in players[i].hand for card in passed)
+
+    # Left, right, across, hold
+    assert offsets == [1, 3, 2, 0, 1]
@@ -0,0 +1,106 @@
+import io
+import random
+
+import pytest
+
+from hearts.game import Game, replay_round
+from hearts.players import MCTSPlayer, RandomPlayer
+from hearts.rules import Rules
+from hearts.snapshot import (
+    CARDS,
+    RECORD_SIZE,
+    GameSnapshot,
+    RoundLogWriter,
+    RoundRecord,
+    decode_deal,
+    decode_plays,
+    encode_deal,
+    encode_plays,
+    read_round_log,
+)
+
+
+def random_players() -> list[RandomPlayer]:
+    return [RandomPlayer(f"Player {i + 1}") for i in range(4)]
+
+
+def mcts_players() -> list:
+    return [MCTSPlayer("Player 1", iterations=30)] + random_players()[1:]
+
+
+def play_rounds(rules: Rules, seed: int = 0) -> list[RoundRecord]:
+    random.seed(seed)
+    file = io.BytesIO()
+    Game(random_players(), print_scores=False, round_log=RoundLogWriter(file), rules=rules).play()
+    file.seek(0)
+    return list(read_round_log(file))
+
+
+def test_deal_round_trip():
+    rng = random.Random(0)
+    for _ in range(100):
+        deck = list(CARDS)
+        rng.shuffle(deck)
+        hands = [deck[i : i + 13] for i in range(0, 52, 13)]
+        assert decode_deal(encode_deal(hands)) == hands
+
+
+def test_plays_round_trip():
+    record = play_rounds(Rules())[0]
+    for count in range(0, 53, 4):
+        data = encode_plays(record.hands, record.plays[:count], record.lead_player_index)
+        plays = decode_plays(data, record.hands, record.lead_player_index, count)
+        assert plays == record.plays[:count]
+
+
+@pytest.mark.parametrize("rules", [Rules(), Rules.full()])
+def test_record_round_trip(rules):
+    for record in play_rounds(rules):
+        data = record.to_bytes()
+        assert len(data) == RECORD_SIZE
+        assert RoundRecord.from_bytes(data) == record
+
+
+def test_log_replays_scores():
+    for record in play_rounds(Rules.full()):
+        assert record.rules == Rules.full()
+        assert replay_round(record).round_scores == record.round_scores
+
+
+@pytest.mark.parametrize("rules", [Rules(), Rules.full()])
+@pytest.mark.parametrize("make_players", [random_players, mcts_players])
+@pytest.mark.parametrize("seed", range(3))
+def test_resume_snapshot_with_rng(rules, make_players, seed):
+    random.seed(seed)
+    game = Game(make_players(), print_scores=False, rules=rules)
+    game.deal()
+    for _ in range(5):
+        game.play_trick()
+    data = game.snapshot(include_rng=True).to_bytes()
+
+    results = game.play()
+
+    snapshot = GameSnapshot.from_bytes(data)
+    assert snapshot.rules == rules
+    resumed = Game.from_snapshot(snapshot, make_players(), print_scores=False)
+    assert resumed.play() == results
+
+
+def test_rejects_wrong_magic():
+    with pytest.raises(ValueError, match="Not a round log"):
+        list(read_round_log(io.BytesIO(b"NOPE\x02" + bytes(RECORD_SIZE))))
+    with pytest.raises(ValueError, match="Not a round log"):
+        list(read_round_log(io.BytesIO(b"HR")))
+    with pytest.raises(ValueError, match="Not a game snapshot"):
+        GameSnapshot.from_bytes(b"NOPE" + bytes(32))
+
+
+def test_rejects_truncated_log():
+    file = io.BytesIO()
+    writer = RoundLogWriter(file)
+    for record in play_rounds(Rules()):
+        writer.write(record)
+
+    data = file.getvalue()[:-1]
+    with pytest.raises(ValueError, match="Truncated round log"):
+        list(read_round_log(io.BytesIO(data)))